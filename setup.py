@@ -111,6 +111,9 @@ setup(
             # the replacement of the old xmlrunner package
             "unittest-xml-reporting",
             "coverage~=6.0",
+            # the last releases which support Python 3.7, used on CI
+            "pytest>=6.2,<8",
+            "pytest-xdist>=2.5,<3.4",
             "black",
             "pre-commit",
         ],